@@ -1,5 +1,6 @@
 #! /usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
 import os
 import os.path
 import subprocess
@@ -8,9 +9,27 @@ import subprocess
 source_dir = os.path.dirname(__file__)
 icon_prefix = os.path.join(source_dir, 'icons')
 svg_file = os.path.join(source_dir, 'scriggle.svg')
-for size in [16, 22, 24, 48]:
+icon_sizes = [16, 22, 24, 48]
+
+
+def rasterize(size):
+    """Render the SVG icon to a PNG file of the given size."""
     icon_dir = os.path.join(icon_prefix, f'{size}x{size}')
     os.makedirs(icon_dir, exist_ok=True)
     icon_file = os.path.join(icon_dir, 'scriggle.png')
     subprocess.run(['inkscape', svg_file, f'--export-png={icon_file}',
-                    f'--export-width={size}', f'--export-height={size}'])
+                    f'--export-width={size}', f'--export-height={size}'],
+                   check=True)
+
+
+def rasterize_all(sizes):
+    """Render the icons for all of ‘sizes’ in parallel."""
+    # Each job just waits on an inkscape process, so threads suffice.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Consume the results so that errors are raised here.
+        for _ in executor.map(rasterize, sizes):
+            pass
+
+
+if __name__ == '__main__':
+    rasterize_all(icon_sizes)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from gettext import gettext as _
 
 import gi
@@ -194,10 +195,10 @@ class Editor(Gtk.ApplicationWindow):
         )
 
     def on_language_changed(self, language_id):
-        lang_man = GtkSource.LanguageManager.get_default()
         if language_id == 'plain':
             self.buffer.set_language(None)
         else:
+            lang_man = GtkSource.LanguageManager.get_default()
             self.buffer.set_language(lang_man.get_language(language_id))
 
     def on_use_spaces(self, use_spaces):
@@ -523,10 +524,11 @@ class SaveIndicator(Gtk.Grid):
             orientation=Gtk.Orientation.HORIZONTAL, no_show_all=True
         )
 
-        save_label = Gtk.Label(_('Saving…'))
+        saving_text, cancel_text = _get_save_indicator_text()
+        save_label = Gtk.Label(saving_text)
         self.add(save_label)
 
-        save_cancel_button = Gtk.Button.new_with_label(_('Cancel'))
+        save_cancel_button = Gtk.Button.new_with_label(cancel_text)
         save_cancel_button.connect(
             'clicked', lambda b: self.emit('cancel-clicked')
         )
@@ -537,6 +539,17 @@ class SaveIndicator(Gtk.Grid):
         pass
 
 
+@lru_cache(maxsize=None)
+def _get_save_indicator_text():
+    """
+    Return the translated label and button text for SaveIndicator.
+
+    This is a function, not a constant, so that nothing is translated
+    before main() binds the text domain.
+    """
+    return _('Saving…'), _('Cancel')
+
+
 class MenuRevealer(Gtk.Revealer):
     def __init__(self, command_manager):
         super().__init__(transition_type=Gtk.RevealerTransitionType.SLIDE_UP)
@@ -1,9 +1,49 @@
+from functools import lru_cache
 from gettext import gettext as _
 
 import gi
 from gi.repository import GLib, Gdk, Pango, PangoCairo, Gtk
 
 
+_KEYVAL_NAMES = (
+    # Menu.Side.LEFT
+    (
+        ('q', 'w', 'e', 'r', 't'),
+        ('a', 's', 'd', 'f', 'g'),
+        ('z', 'x', 'c', 'v', 'b'),
+    ),
+    # Menu.Side.RIGHT
+    (
+        ('y', 'u', 'i', 'o', 'p', 'bracketleft', 'bracketright'),
+        ('h', 'j', 'k', 'l', 'semicolon', 'apostrophe'),
+        ('n', 'm', 'comma', 'period', 'slash'),
+    ),
+)
+"""For each side of the keyboard, the keyval names in each row."""
+
+
+def _make_keyval_markup(keyval):
+    """Return the markup that shows ‘keyval’ in a menu item."""
+    codepoint = Gdk.keyval_to_unicode(keyval)
+    if 0x20 <= codepoint < 0x7f and chr(codepoint) not in '&<>\'"':
+        # Printable ASCII that needs no escaping
+        return f'<b> {chr(codepoint)}</b>'
+    else:
+        return f'<b> {GLib.markup_escape_text(chr(codepoint))}</b>'
+
+
+_KEYVALS = {
+    name: Gdk.keyval_from_name(name)
+    for rows in _KEYVAL_NAMES for row in rows for name in row
+}
+"""A dictionary mapping the keyval names used in menus to keyvals."""
+
+_KEYVAL_MARKUP = {
+    keyval: _make_keyval_markup(keyval) for keyval in _KEYVALS.values()
+}
+"""A dictionary mapping the keyvals used in menus to their markup."""
+
+
 class AutoSizeLabel(Gtk.Widget):
     """
     A label that chooses an appropriate font size.
@@ -12,13 +52,47 @@ class AutoSizeLabel(Gtk.Widget):
     label tries to reduce its font size to be able to show its whole
     text in the allocation it receives.
     """
+    MAX_MINIMUM_WIDTH = 40
+    """
+    The largest minimum width, in pixels, that this label will request.
+
+    Labels whose text is narrower than this always get enough space to
+    show their text at the standard size.
+    """
+
+    __SCALES = (
+        Pango.SCALE_MEDIUM, Pango.SCALE_SMALL, Pango.SCALE_X_SMALL,
+        Pango.SCALE_XX_SMALL
+    )
+    """The font scale factors to try, from largest to smallest."""
+
     def __init__(self, markup='', **props):
         super().__init__(vexpand=True, **props)
         # XXX: This should be done in the instance init function, but
         # PyGObject doesn’t want anyone to override the instance init
         # function except for Gtk.Template.
         self.set_has_window(False)
+        self.__layout = None
+        self.__standard_size = None
+        """
+        The size of the markup at the standard font size.
+
+        This is None or a tuple (width, height, baseline) in pixels.
+        See __get_standard_size.
+        """
+        self.__scaled_width = 0
+        self.__scaled_height = 0
+        self.__fit = None
+        """
+        The result of the last search for a font size that fits.
+
+        This is None or a tuple (width, height, baseline, size_index,
+        top), where ‘width’ is in Pango units.  See
+        __get_layout_and_top and __set_up_sized_layout.
+        """
+        self.connect('screen-changed', self.__on_screen_changed)
         self.markup = markup
+        self.__color = None
 
     @property
     def markup(self):
@@ -27,34 +101,53 @@ class AutoSizeLabel(Gtk.Widget):
     @markup.setter
     def markup(self, markup):
         self.__markup = markup
-        if markup:
-            layout = self.create_pango_layout(self.__markup)
-            _ink_rect, log_rect = layout.get_pixel_extents()
-            self.__preferred_width = log_rect.width
-        else:
-            self.__preferred_width = 0
+        try:
+            _ok, attributes, self.__text, _accel_char = Pango.parse_markup(
+                markup, -1, '\0'
+            )
+        except GLib.Error:
+            attributes = Pango.AttrList()
+            self.__text = markup
+        # Parse the markup once and scale it by adding an attribute,
+        # rather than wrapping it in a <span> for each size to try.
+        self.__attribute_lists = []
+        for scale in self.__SCALES:
+            if scale == Pango.SCALE_MEDIUM:
+                scaled_attributes = attributes
+            else:
+                scaled_attributes = attributes.copy()
+                scaled_attributes.insert_before(Pango.attr_scale_new(scale))
+            self.__attribute_lists.append(scaled_attributes)
+        self.__fit = None
+        self.__standard_size = None
+        self.__get_standard_size()
 
     def do_get_request_mode(self):
         return Gtk.SizeRequestMode.HEIGHT_FOR_WIDTH
 
     def do_get_preferred_width(self):
-        return min(self.__preferred_width, 40), self.__preferred_width
+        preferred_width, _height, _baseline = self.__get_standard_size()
+        return min(preferred_width, self.MAX_MINIMUM_WIDTH), preferred_width
 
     def do_get_preferred_height_and_baseline_for_width(self, width):
         # Always return the height and baseline for standard size text,
         # even though we might not draw at the standard size.  We don’t
         # want to make the label taller when we are prepared to cram the
         # text into a standard-height space.
-        layout = self.create_pango_layout(self.__markup)
-        _ink_extents, extents = layout.get_pixel_extents()
-        baseline = layout.get_baseline() // Pango.SCALE
-        return extents.height, extents.height, baseline, baseline
+        _width, height, baseline = self.__get_standard_size()
+        return height, height, baseline, baseline
+
+    def do_size_allocate(self, allocation):
+        Gtk.Widget.do_size_allocate(self, allocation)
+        self.__scaled_width = allocation.width * Pango.SCALE
+        self.__scaled_height = allocation.height * Pango.SCALE
 
     def do_draw(self, cr):
-        width = self.get_allocated_width()
+        if not self.__markup:
+            return True
         height = self.get_allocated_height()
         baseline = self.get_allocated_baseline()
-        layout, top = self.__get_layout_and_top(width, height, baseline)
+        layout, top = self.__get_layout_and_top(height, baseline)
         # When the width of the layout is set and it is right-aligned
         # (which is normal for right-to-left text, but can also be
         # requested for left-to-right text), the layout coördinates are
@@ -71,31 +164,134 @@ class AutoSizeLabel(Gtk.Widget):
             extents.x if extents.x >= 0 else extents.x + extents.width,
             extents.y + top
         )
-        style = self.get_style_context()
-        color = style.get_color(style.get_state())
-        Gdk.cairo_set_source_rgba(cr, color)
+        Gdk.cairo_set_source_rgba(cr, self.__get_color())
         # Upper-left (or upper-right; see above) corner of logical
         # extents is at the origin.
         PangoCairo.show_layout(cr, layout)
         return True
 
-    def __get_layout_and_top(self, width, height, baseline):
+    def do_style_updated(self):
+        Gtk.Widget.do_style_updated(self)
+        # The font may have changed.
+        self.__invalidate_layout()
+        self.__color = None
+
+    def __on_screen_changed(self, _widget, _previous_screen):
+        # The resolution may have changed.
+        self.__invalidate_layout()
+
+    def do_state_flags_changed(self, previous_state_flags):
+        Gtk.Widget.do_state_flags_changed(self, previous_state_flags)
+        self.__color = None
+
+    def __get_color(self):
+        """
+        Return the text color.
+
+        The color is looked up the first time it is needed after the
+        style or state changes.
+        """
+        if self.__color is None:
+            style = self.get_style_context()
+            self.__color = style.get_color(style.get_state())
+        return self.__color
+
+    def __get_layout(self):
+        """
+        Return the layout used to measure and draw the label.
+
+        The same layout is reused until the font or resolution might
+        have changed.  Callers must set every layout attribute they
+        depend on, since other callers may have changed them.
+        """
+        if self.__layout is None:
+            self.__layout = self.create_pango_layout('')
+            # This has no effect until a width is set.
+            self.__layout.set_wrap(Pango.WrapMode.WORD_CHAR)
+            self.__layout_width = -1
+            self.__layout_height = -1
+            self.__layout_text = None
+            self.__layout_attributes = None
+        return self.__layout
+
+    def __invalidate_layout(self):
+        """Discard the layout and everything measured with it."""
+        self.__layout = None
+        self.__fit = None
+        self.__standard_size = None
+
+    def __get_standard_size(self):
+        """
+        Return the size of the markup at the standard font size.
+
+        Return a tuple (width, height, baseline) in pixels for the
+        whole markup, unwrapped.  This is only measured again when the
+        markup or the font changes.
+        """
+        if self.__standard_size is None:
+            layout = self.__get_layout()
+            self.__set_layout_size(-1, -1)
+            layout.set_ellipsize(Pango.EllipsizeMode.NONE)
+            self.__set_layout_contents(0)
+            _ink_extents, extents = layout.get_pixel_extents()
+            baseline = layout.get_baseline() // Pango.SCALE
+            self.__standard_size = extents.width, extents.height, baseline
+        return self.__standard_size
+
+    def __set_layout_contents(self, scale_index):
         """
-        Create a layout and return it with its top coördinate.
+        Set the layout to show the markup at a given scale.
 
-        Given the width, height, and baseline of a rectangle, generate
-        a layout to render the label’s markup into that rectangle,
+        Show the markup scaled by self.__SCALES[scale_index], only
+        changing the text and attributes of the layout if needed.
+        """
+        layout = self.__get_layout()
+        if self.__text != self.__layout_text:
+            layout.set_text(self.__text, -1)
+            self.__layout_text = self.__text
+        attributes = self.__attribute_lists[scale_index]
+        if attributes is not self.__layout_attributes:
+            layout.set_attributes(attributes)
+            self.__layout_attributes = attributes
+
+    def __set_layout_size(self, width, height):
+        """
+        Set the width and height of the layout in Pango units.
+
+        Only call into Pango for the dimensions that actually change.
+        """
+        layout = self.__get_layout()
+        if width != self.__layout_width:
+            layout.set_width(width)
+            self.__layout_width = width
+        if height != self.__layout_height:
+            layout.set_height(height)
+            self.__layout_height = height
+
+    def __get_layout_and_top(self, height, baseline):
+        """
+        Set up the layout and return it with its top coördinate.
+
+        Given the height and baseline of the allocation, set up the
+        layout to render the label’s markup into the allocation,
         aligning to the baseline if possible.  ‘baseline’ may be -1 to
         indicate no baseline preference.  Return the layout and the y-
         coördinate where the top of the layout should be relative to the
-        given rectangle.
+        allocation.
         """
-        layout = self.create_pango_layout('')
-        # Don’t request ellipsization here because then it won’t wrap.
-        layout.set_wrap(Pango.WrapMode.WORD_CHAR)
-        layout.set_width(width * Pango.SCALE)
-        for size in ('medium', 'small', 'x-small', 'xx-small'):
-            layout.set_markup(f'<span size="{size}">{self.__markup}</span>')
+        width = self.__scaled_width
+        first_size_index = 0
+        if self.__fit is not None:
+            fit_width, fit_height, fit_baseline, size_index, top = self.__fit
+            if (width, height, baseline) == (
+                    fit_width, fit_height, fit_baseline
+            ):
+                return self.__set_up_sized_layout(size_index), top
+            elif width <= fit_width and height <= fit_height:
+                # Sizes that didn’t fit before won’t fit in less space.
+                first_size_index = size_index
+        for size_index in range(first_size_index, len(self.__SCALES)):
+            layout = self.__set_up_sized_layout(size_index)
             _ink_extents, extents = layout.get_pixel_extents()
             if extents.height <= height:
                 # Text fits at this size.
@@ -111,12 +307,72 @@ class AutoSizeLabel(Gtk.Widget):
                 break
         else:
             # Text doesn’t fit even at the smallest size, so ellipsize.
-            layout.set_ellipsize(Pango.EllipsizeMode.MIDDLE)
-            layout.set_height(height * Pango.SCALE)
+            size_index = len(self.__SCALES)
+            layout = self.__set_up_sized_layout(size_index)
             _ink_extents, extents = layout.get_pixel_extents()
             top = (height - extents.height) // 2
+        self.__fit = width, height, baseline, size_index, top
         return layout, top
 
+    def __set_up_sized_layout(self, size_index):
+        """
+        Set up the layout to show the markup at a reduced size.
+
+        Wrap the markup to the allocated width and show it scaled by
+        self.__SCALES[size_index].  If ‘size_index’ is
+        len(self.__SCALES), use the smallest size and ellipsize the
+        markup to fit the allocated height.  Return the layout.
+        """
+        layout = self.__get_layout()
+        if size_index < len(self.__SCALES):
+            # Don’t request ellipsization here because then it won’t
+            # wrap.
+            layout.set_ellipsize(Pango.EllipsizeMode.NONE)
+            self.__set_layout_size(self.__scaled_width, -1)
+            self.__set_layout_contents(size_index)
+        else:
+            layout.set_ellipsize(Pango.EllipsizeMode.MIDDLE)
+            self.__set_layout_size(self.__scaled_width, self.__scaled_height)
+            self.__set_layout_contents(len(self.__SCALES) - 1)
+        return layout
+
+
+class FixedSizeLabel(Gtk.Label):
+    """
+    A label that always shows its text at the standard size.
+
+    This is a cheaper stand-in for AutoSizeLabel that can be used when
+    the text is known to fit, so no font size needs to be chosen.
+    """
+    def __init__(self, markup='', **props):
+        super().__init__(vexpand=True, **props)
+        self.markup = markup
+
+    @property
+    def markup(self):
+        return self.get_label()
+
+    @markup.setter
+    def markup(self, markup):
+        self.set_markup(markup)
+
+    @staticmethod
+    def fits(widget, markup):
+        """
+        Check whether a FixedSizeLabel can stand in for an AutoSizeLabel.
+
+        Return True if ‘markup’, rendered in the font of ‘widget’, is
+        narrow enough that an AutoSizeLabel would never need to shrink
+        it.  ‘widget’ should be the label that shows the markup, or one
+        styled like it, so that it has the right font.
+        """
+        if not markup:
+            return True
+        layout = widget.create_pango_layout('')
+        layout.set_markup(markup)
+        _ink_rect, log_rect = layout.get_pixel_extents()
+        return log_rect.width <= AutoSizeLabel.MAX_MINIMUM_WIDTH
+
 
 class MenuItemMixin:
     """
@@ -129,18 +385,16 @@ class MenuItemMixin:
     def __init__(self, **props):
         super().__init__(focus_on_click=False, **props)
 
-        self.__grid = Gtk.Grid(
+        self.__box = Gtk.Box(
             orientation=Gtk.Orientation.HORIZONTAL, vexpand=False
         )
-        self.add(self.__grid)
+        self.add(self.__box)
 
-        self.__label = AutoSizeLabel(
-            hexpand=True, halign=Gtk.Align.START, valign=Gtk.Align.BASELINE
-        )
-        self.__grid.add(self.__label)
+        self.__label = self.__new_label(FixedSizeLabel)
+        self.__box.pack_start(self.__label, True, True, 0)
 
         self.__keyval_label = Gtk.Label(valign=Gtk.Align.BASELINE)
-        self.__grid.add(self.__keyval_label)
+        self.__box.pack_start(self.__keyval_label, False, False, 0)
 
         self.keyval = None
 
@@ -151,10 +405,11 @@ class MenuItemMixin:
     @keyval.setter
     def keyval(self, keyval):
         if keyval is not None:
-            kvs = chr(Gdk.keyval_to_unicode(keyval))
-            self.__keyval_label.set_markup(
-                f'<b> {GLib.markup_escape_text(kvs)}</b>'
-            )
+            try:
+                markup = _KEYVAL_MARKUP[keyval]
+            except KeyError:
+                markup = _make_keyval_markup(keyval)
+            self.__keyval_label.set_markup(markup)
         else:
             self.__keyval_label.set_markup('')
         self.__keyval = keyval
@@ -165,8 +420,67 @@ class MenuItemMixin:
 
     @label.setter
     def label(self, markup):
+        # Most labels are short enough that they never need to be
+        # shrunk, so only use an AutoSizeLabel when it is needed.
+        # Measure with the current label, since a replacement would be
+        # styled the same way.
+        measuring_label = self.__label
+        if FixedSizeLabel.fits(measuring_label, markup):
+            self.__set_label_class(FixedSizeLabel)
+            if self.__label is measuring_label:
+                # The new text has just been checked with this font.
+                measuring_label.__checked_font = self.__get_font(
+                    measuring_label
+                )
+        else:
+            self.__set_label_class(AutoSizeLabel)
         self.__label.markup = markup
 
+    def __set_label_class(self, label_class):
+        """Replace the label with one of class ‘label_class’ if needed."""
+        if type(self.__label) is not label_class:
+            old_label = self.__label
+            self.__label = self.__new_label(label_class)
+            self.__box.remove(old_label)
+            self.__box.pack_start(self.__label, True, True, 0)
+            self.__box.reorder_child(self.__label, 0)
+            self.__label.props.visible = old_label.props.visible
+
+    def __new_label(self, label_class):
+        label = label_class(
+            hexpand=True, halign=Gtk.Align.START, valign=Gtk.Align.BASELINE
+        )
+        if label_class is FixedSizeLabel:
+            label.__checked_font = None
+            """The font the label’s text was last found to fit in."""
+            label.connect(
+                'style-updated', self.__on_fixed_label_style_updated
+            )
+        return label
+
+    @staticmethod
+    def __get_font(label):
+        return label.get_pango_context().get_font_description()
+
+    def __on_fixed_label_style_updated(self, label):
+        # A larger font, or the label’s final style once it is in a
+        # menu, may make the text too wide to show at the standard
+        # size.  An AutoSizeLabel is never replaced here, so the two
+        # classes can’t keep replacing each other.
+        if label is not self.__label:
+            return
+        # Most style changes, like hovering or pressing a key, leave the
+        # font alone, so only measure again when the font has changed.
+        font = self.__get_font(label)
+        checked_font = label.__checked_font
+        if checked_font is not None and font.equal(checked_font):
+            return
+        label.__checked_font = font
+        markup = label.markup
+        if not FixedSizeLabel.fits(label, markup):
+            self.__set_label_class(AutoSizeLabel)
+            self.__label.markup = markup
+
 
 class MenuItem(MenuItemMixin, Gtk.Button):
     def __init__(self, repeat=False, **props):
@@ -185,12 +499,17 @@ class MenuItem(MenuItemMixin, Gtk.Button):
 
     def key_event(self, event):
         if self.is_sensitive():
+            # Autorepeat sends repeated presses, so only change the
+            # state flags when needed to avoid restyling every time.
+            active = self.get_state_flags() & Gtk.StateFlags.ACTIVE
             if event.type == Gdk.EventType.KEY_PRESS:
-                self.set_state_flags(Gtk.StateFlags.ACTIVE, False)
+                if not active:
+                    self.set_state_flags(Gtk.StateFlags.ACTIVE, False)
                 if self.__repeat:
                     self.clicked()
             else:
-                self.unset_state_flags(Gtk.StateFlags.ACTIVE)
+                if active:
+                    self.unset_state_flags(Gtk.StateFlags.ACTIVE)
                 if not self.__repeat:
                     self.clicked()
             return True
@@ -211,6 +530,73 @@ class ToggleMenuItem(MenuItemMixin, Gtk.ToggleButton):
             return False
 
 
+def _get_key_x(column, y):
+    """
+    Return the grid column number of a key.
+
+    Given the coördinates of a key, return the leftmost column its
+    button occupies in the grid.
+    """
+    return 4*column + 3*y//2
+
+
+def _make_key_table(keyval_names):
+    """
+    Lay out the keys on one side of the keyboard.
+
+    Given a list of rows of keyval names, return a tuple with an
+    (x, y, keyval) tuple for each key, where x and y are the grid
+    coördinates of its button.
+    """
+    return tuple(
+        (_get_key_x(column, y), y, _KEYVALS[name])
+        for y, names in enumerate(keyval_names)
+        for column, name in enumerate(names)
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_back_button_text():
+    """
+    Return the translated label and tooltip for back buttons.
+
+    The translations are looked up on the first call rather than at
+    import, because the text domain has not been set up at import.
+    """
+    return _('Back'), _('Go back to the previous menu')
+
+
+def _get_cells(x, y, width, height):
+    """
+    Iterate over the grid cells in a rectangle.
+
+    Return an iterator that yields an (x, y) tuple for each cell in the
+    rectangle given by (x, y, width, height).
+    """
+    return (
+        (cell_x, cell_y)
+        for cell_y in range(y, y + height)
+        for cell_x in range(x, x + width)
+    )
+
+
+class _UnusedKeyCell(Gtk.Button):
+    """
+    A placeholder for a key that is not bound to anything.
+
+    This is an insensitive button, so the theme draws it like the other
+    keys, but it holds just a label with the key instead of the box and
+    two labels of a MenuItem.
+    """
+    def __init__(self, keyval, **props):
+        super().__init__(sensitive=False, focus_on_click=False, **props)
+        try:
+            markup = _KEYVAL_MARKUP[keyval]
+        except KeyError:
+            markup = _make_keyval_markup(keyval)
+        self.add(Gtk.Label(label=markup, use_markup=True, xalign=1.0))
+
+
 def make_menu_class(widget_class):
     class Menu(widget_class):
         """
@@ -230,30 +616,14 @@ def make_menu_class(widget_class):
             LEFT = 0
             RIGHT = 1
 
-        __keyvals = [
-            # Side.LEFT
-            list(
-                map(
-                    lambda kns: list(map(Gdk.keyval_from_name, kns)),
-                    [
-                        ['q', 'w', 'e', 'r', 't'],
-                        ['a', 's', 'd', 'f', 'g'],
-                        ['z', 'x', 'c', 'v', 'b'],
-                    ]
-                )
-            ),
-            # Side.RIGHT
-            list(
-                map(
-                    lambda kns: list(map(Gdk.keyval_from_name, kns)),
-                    [
-                        ['y', 'u', 'i', 'o', 'p', 'bracketleft', 'bracketright'],
-                        ['h', 'j', 'k', 'l', 'semicolon', 'apostrophe'],
-                        ['n', 'm', 'comma', 'period', 'slash'],
-                    ]
-                )
-            )
-        ]
+        __keys = tuple(map(_make_key_table, _KEYVAL_NAMES))
+        """
+        For each side, a tuple of (x, y, keyval) tuples for its keys.
+        """
+        __key_coörds = tuple(
+            {keyval: (x, y) for x, y, keyval in keys} for keys in __keys
+        )
+        """For each side, a dictionary mapping keyvals to coördinates."""
 
         def __init__(self, side, command_manager, **props):
             """
@@ -268,29 +638,30 @@ def make_menu_class(widget_class):
             ‘props’ contains GObject properties to be set.
 
             Subclasses will probably want to call add_unused_keys at the end
-            of their constructor.
+            of their constructor.  Property notifications are held back
+            until then, so that building the menu only causes one round
+            of updates.
             """
             super().__init__(**props)
+            self.freeze_notify()
             self.__grid = None
             self.__side = side
             self.__command_manager = command_manager
-            self.__submenus = set()
+            self.__pending_submenus = []
             """
-            The set of this menu’s submenus.
+            The submenus waiting for this menu to be added to the stack.
 
-            This is used to add the submenus to the stack *after* this menu
-            has been added to the stack.
+            They are added to the stack *after* this menu has been added
+            to the stack.
             """
             self.__items = {}
             """A dictionary mapping keyvals to the MenuItems they are bound to."""
             self.focus_widget = None
             """The widget that will receive focus when the menu is shown."""
-            self.__extra_widgets = set()
-            """
-            The set of extra (non-key) widgets added to this Menu.
-
-            This is a set of tuples with the format (x, y, width, height, widget).
-            """
+            self.__key_cells = {}
+            """A dictionary mapping grid cells to the bound keys in them."""
+            self.__extra_widget_cells = set()
+            """The set of grid cells occupied by extra (non-key) widgets."""
 
         def _set_grid(self, grid):
             """Set the grid to be used as a keyboard grid."""
@@ -334,39 +705,54 @@ def make_menu_class(widget_class):
             arguments on the command manager when clicked.  Return the
             MenuItem.
             """
+            # Commands are created once and never replaced, so look this
+            # one up now instead of every time the item is activated.
+            command = getattr(self.__command_manager, command_name)
             return self.bind_key_to_callback(
-                keyval_name, label,
-                lambda: getattr(self.__command_manager, command_name)(),
-                tooltip, repeat
+                keyval_name, label, command, tooltip, repeat
             )
 
         def bind_key_to_toggle(
                 self, keyval_name, label, command_name, tooltip=None
         ):
             item = ToggleMenuItem()
+            command = getattr(self.__command_manager, command_name)
             item.connect(
-                'toggled',
-                lambda button:
-                    getattr(self.__command_manager, command_name)(
-                        button.props.active
-                    )
+                'toggled', lambda button: command(button.props.active)
             )
             self.__install_item(item, keyval_name, label, tooltip)
 
         def bind_key_to_submenu(self, keyval_name, label, submenu, tooltip=None):
-            self.__submenus.add(submenu)
+            """
+            Bind a key to a submenu.
+
+            ‘submenu’ is either a Menu or a function that takes no
+            arguments and returns one.  A function is only called when
+            the submenu is first opened, so menus that are never opened
+            are never built.
+            """
+            if callable(submenu):
+                submenu_factory = submenu
+                submenu = None
+            elif self.stack is not None:
+                self.stack.on_add_submenu(submenu)
+            else:
+                self.__pending_submenus.append(submenu)
+            def on_clicked(button):
+                nonlocal submenu
+                if submenu is None:
+                    submenu = submenu_factory()
+                    self.stack.on_add_submenu(submenu)
+                self.stack.on_show_submenu(submenu)
             item = MenuItem()
-            item.connect(
-                'clicked', lambda button: self.stack.on_show_submenu(submenu)
-            )
+            item.connect('clicked', on_clicked)
             self.__install_item(item, keyval_name, label, tooltip)
 
         def bind_key_to_back_button(self, keyval_name):
             item = MenuItem()
             item.connect('clicked', lambda button: self.stack.on_go_back())
-            self.__install_item(
-                item, keyval_name, _('Back'), _('Go back to the previous menu')
-            )
+            label, tooltip = _get_back_button_text()
+            self.__install_item(item, keyval_name, label, tooltip)
 
         def bind_key_to_widget(self, keyval_name, label, widget, tooltip=None):
             item = MenuItem()
@@ -377,68 +763,74 @@ def make_menu_class(widget_class):
             self.__install_item(item, keyval_name, label, tooltip)
 
         def __install_item(self, item, keyval_name, label, tooltip):
-            keyval = Gdk.keyval_from_name(keyval_name)
-            item.keyval = keyval
-            item.label = label
-            if tooltip is not None:
-                item.props.tooltip_markup = tooltip
-            item.show_all()
+            try:
+                keyval = _KEYVALS[keyval_name]
+            except KeyError:
+                # This will be reported by __keyval_to_coörds.
+                keyval = Gdk.keyval_from_name(keyval_name)
+            with item.freeze_notify():
+                item.keyval = keyval
+                item.label = label
+                if tooltip is not None:
+                    item.props.tooltip_markup = tooltip
+                item.show_all()
             x, y = self.__keyval_to_coörds(keyval)
             self.__check_key_for_overlap(x, y)
             self.__grid.attach(item, x, y, 4, 1)
             self.__items[keyval] = item
+            for cell in _get_cells(x, y, 4, 1):
+                self.__key_cells[cell] = keyval
 
         def __keyval_to_coörds(self, keyval):
-            for x, y, found_keyval in self.__iter_keyvals_with_coörds():
-                if found_keyval == keyval:
-                    return x, y
-            raise ValueError(
-                f'Keyval {keyval} ({Gdk.keyval_name(keyval)}) not found'
-            )
+            try:
+                return self.__key_coörds[self.__side][keyval]
+            except KeyError:
+                raise ValueError(
+                    f'Keyval {keyval} ({Gdk.keyval_name(keyval)}) not found'
+                ) from None
 
         def add_extra_widget(self, widget, x, y, width, height):
             self.__check_widget_for_overlap(x, y, width, height)
             self.__grid.attach(widget, x, y, width, height)
-            self.__extra_widgets.add((x, y, width, height, widget))
+            self.__extra_widget_cells.update(_get_cells(x, y, width, height))
 
         def add_unused_keys(self):
             """
-            Add insensitive menu items for unbound keys.
+            Add insensitive placeholders for unbound keys.
 
             This must be called after all calls to bind_key_* and
             add_extra_widget and before using the menu.  Subclasses
             probably want to call this at the end of their constructor,
             although this makes it hard to derive further sub-subclasses.
+            This also releases the property notifications held back
+            since the menu was created.
             """
             for x, y, keyval in self.__iter_keyvals_with_coörds():
                 if (
                         keyval not in self.__items
                         and not self.__key_overlaps_extra_widget(x, y)
                 ):
-                    item = MenuItem(sensitive=False)
-                    item.keyval = keyval
-                    self.__grid.attach(item, x, y, 4, 1)
+                    cell = _UnusedKeyCell(keyval)
+                    self.__grid.attach(cell, x, y, 4, 1)
+            self.thaw_notify()
 
         def __key_overlaps_extra_widget(self, x, y):
             """
             Check whether a given key would overlap an existing extra widget.
 
-            If the key at grid coördinates (x, y) overlaps a widget
-            in self.__extra_widgets, return True.  Otherwise, False.
+            If the key at grid coördinates (x, y) overlaps an extra
+            widget, return True.  Otherwise, False.
             """
-            for widget_x, widget_y, width, height, widget in self.__extra_widgets:
-                if -3 <= x - widget_x < width and 0 <= y - widget_y < height:
-                    # Key is inside an extra widget
-                    return True
-            else:
-                return False
+            return not self.__extra_widget_cells.isdisjoint(
+                _get_cells(x, y, 4, 1)
+            )
 
         def __check_key_for_overlap(self, x, y):
             """
             Check whether a given key would overlap an existing extra widget.
 
-            If the key at grid coördinates (x, y) overlaps a widget
-            in self.__extra_widgets, raise a ValueError.
+            If the key at grid coördinates (x, y) overlaps an extra
+            widget, raise a ValueError.
             """
             if self.__key_overlaps_extra_widget(x, y):
                 raise ValueError(
@@ -452,11 +844,9 @@ def make_menu_class(widget_class):
             If the rectangle given by (x, y, width, height) overlaps one of
             the bound keys, raise a ValueError.
             """
-            for key_x, key_y, keyval in self.__iter_keyvals_with_coörds():
-                if (
-                        keyval in self.__items
-                        and x - 3 <= key_x < x + width and y <= key_y < y + height
-                ):
+            for cell in _get_cells(x, y, width, height):
+                keyval = self.__key_cells.get(cell)
+                if keyval is not None:
                     raise ValueError(
                         f'Widget at ({x}, {y}) ({width}×{height}) would '
                         f'overlap key {Gdk.keyval_name(keyval)}'
@@ -466,17 +856,16 @@ def make_menu_class(widget_class):
             """
             Iterate over keyvals and their coördinates.
 
-            This is an iterator that yields an (x, y, keyval) tuple for each
-            key that is available on this side of the keyboard.
+            Return an iterator that yields an (x, y, keyval) tuple for
+            each key that is available on this side of the keyboard.
             """
-            for y, keyvals in enumerate(self.__keyvals[self.__side]):
-                for column, keyval in enumerate(keyvals):
-                    yield self.__get_key_x(column, y), y, keyval
+            return iter(self.__keys[self.__side])
 
         def do_parent_set(self, old_parent):
-            if old_parent is None:
-                for submenu in self.__submenus:
+            if old_parent is None and self.stack is not None:
+                for submenu in self.__pending_submenus:
                     self.stack.on_add_submenu(submenu)
+                self.__pending_submenus.clear()
 
         @property
         def side(self):
@@ -486,16 +875,6 @@ def make_menu_class(widget_class):
         def stack(self):
             return self.props.parent
 
-        @staticmethod
-        def __get_key_x(column, y):
-            """
-            Return the grid column number of a key.
-
-            Given the coördinates of a key, return the leftmost column
-            its button occupies in the grid.
-            """
-            return 4*column + 3*y//2
-
         def key_event(self, event):
             """
             Process a key event.
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from gettext import gettext as _
 import weakref
 
@@ -59,6 +60,7 @@ class MenuArea(Gtk.Overlay):
 class CursorPositionLabel(Gtk.Label):
     def __init__(self, **props):
         super().__init__(**props)
+        self.__line = self.__column = None
         self.position = 0, 0
 
     @property
@@ -68,10 +70,27 @@ class CursorPositionLabel(Gtk.Label):
 
     @position.setter
     def position(self, position):
+        if position == (self.__line, self.__column):
+            return
         self.__line, self.__column = position
-        self.props.label = _('Line {0}, Column {1}').format(
-            self.__line + 1, self.__column + 1
-        )
+        self.props.label = _format_position(self.__line, self.__column)
+
+
+@lru_cache(maxsize=256)
+def _format_position(line, column):
+    """Return the text showing a zero-based line and column number."""
+    return _get_position_format().format(line + 1, column + 1)
+
+
+@lru_cache(maxsize=None)
+def _get_position_format():
+    """
+    Return the translated format string for CursorPositionLabel.
+
+    It is only translated once, on the first call, which comes after
+    the text domain has been set up.
+    """
+    return _('Line {0}, Column {1}')
 
 
 class MenuStack(Gtk.Stack):
@@ -112,9 +131,16 @@ class MenuStack(Gtk.Stack):
         self.menu_revealer.menu_pinned = False
 
     def on_add_submenu(self, submenu):
+        # Most submenus are never opened, so don’t let show_all on the
+        # window show them.  They are shown the first time they are
+        # opened instead.
+        submenu.props.no_show_all = True
         self.add(submenu)
 
     def on_show_submenu(self, submenu):
+        if submenu.props.no_show_all:
+            submenu.props.no_show_all = False
+            submenu.show_all()
         if submenu.focus_widget is not None:
             self.pin_menu(submenu.focus_widget)
         self.__history.append(self.props.visible_child)
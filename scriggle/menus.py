@@ -1,3 +1,5 @@
+from bisect import bisect_left
+from functools import lru_cache
 from gettext import gettext as _
 
 import gi
@@ -6,6 +8,21 @@ from gi.repository import GLib, Gdk, Gtk, GtkSource
 from .menu import Menu, make_menu_class
 
 
+# These are used on every keystroke while searching the language list.
+_get_monotonic_time = GLib.get_monotonic_time
+_timeout_add = GLib.timeout_add
+
+_KEYVAL_CODEPOINTS = {
+    keyval: Gdk.keyval_to_unicode(keyval) for keyval in range(0x20, 0x7f)
+}
+"""
+A dictionary mapping the keyvals of printable ASCII characters to their
+code points.
+
+This covers most of what is typed into the language search.
+"""
+
+
 class Left(Menu):
     def __init__(self, command_manager):
         super().__init__(Menu.Side.LEFT, command_manager)
@@ -37,7 +54,7 @@ class Left(Menu):
             _('Move the cursor right by a word'), repeat=True
         )
         self.bind_key_to_submenu(
-            't', _('Selection…'), Selection(command_manager),
+            't', _('Selection…'), lambda: Selection(command_manager),
             _('Commands to change the selection')
         )
         self.add_unused_keys()
@@ -91,7 +108,7 @@ class Right(Menu):
     def __init__(self, command_manager):
         super().__init__(Menu.Side.RIGHT, command_manager)
         self.bind_key_to_submenu(
-            'y', _('Style…'), Style(command_manager),
+            'y', _('Style…'), lambda: Style(command_manager),
             _('Options related to code style')
         )
         self.bind_key_to_action(
@@ -102,7 +119,8 @@ class Right(Menu):
         )
         self.bind_key_to_action('o', _('Open…'), 'open')
         self.bind_key_to_submenu(
-            'j', _('Find…'), Find(command_manager), _("Find and replace")
+            'j', _('Find…'), lambda: Find(command_manager),
+            _("Find and replace")
         )
         self.bind_key_to_action('k', _('Save'), 'save')
         self.add_unused_keys()
@@ -113,7 +131,7 @@ class Style(Menu):
         super().__init__(Menu.Side.RIGHT, command_manager)
         self.bind_key_to_back_button('bracketright')
         self.bind_key_to_submenu(
-            'j', _('Language…'), Language(command_manager),
+            'j', _('Language…'), lambda: Language(command_manager),
             _('Set the computer language to highlight syntax for')
         )
         self.bind_key_to_toggle(
@@ -167,16 +185,89 @@ class Language(Menu):
     def __on_language_changed(self, language_list):
         iters = language_list.get_selected_items()
         if iters:
-            iter_ = language_list.props.model.get_iter(iters[0])
-            (id_,) = language_list.props.model.get(
-                iter_, language_list.COLUMN_ID
-            )
+            model = language_list.props.model
+            iter_ = model.get_iter(iters[0])
+            id_ = model.get_value(iter_, language_list.COLUMN_ID)
             self.__command_manager.set_language(id_)
 
 
+def _normalize_for_search(text):
+    """
+    Normalize a language name or search string for comparison.
+
+    Searches ignore case and spaces, so that, for example, “python3”
+    matches “Python 3”.  Names and search strings must be normalized
+    the same way for the search to work.
+    """
+    if text.isascii():
+        # Casefolding ASCII is just lowercasing, so both steps can be
+        # done in one pass.
+        return text.translate(_ASCII_SEARCH_FOLD)
+    else:
+        return text.casefold().replace(' ', '')
+
+
+_ASCII_SEARCH_FOLD = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz', ' '
+)
+"""The translation table _normalize_for_search uses for ASCII text."""
+
+
+@lru_cache(maxsize=None)
+def _get_language_rows():
+    """
+    Return the rows to show in a LanguageList.
+
+    Return a tuple containing an (id, name) tuple for each language
+    that can be selected.  The languages are only enumerated on the
+    first call.
+    """
+    rows = [('plain', _('Plain'))]
+    lang_man = GtkSource.LanguageManager.get_default()
+    get_language = lang_man.get_language
+    for lang_id in lang_man.props.language_ids:
+        lang_props = get_language(lang_id).props
+        if not lang_props.hidden:
+            rows.append((lang_id, lang_props.name))
+    return tuple(rows)
+
+
+@lru_cache(maxsize=None)
+def _get_sorted_language_names():
+    """
+    Return the search index for the rows of a LanguageList.
+
+    Return a sorted list of (normalized_name, row_index) tuples, one
+    for each row from _get_language_rows.
+    """
+    return sorted(
+        (_normalize_for_search(name), index)
+        for index, (_id, name) in enumerate(_get_language_rows())
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_language_model():
+    """
+    Return the model shown by every LanguageList.
+
+    The model is never modified after it is filled, so the windows’
+    language menus can all share it instead of each filling their own.
+    """
+    # Fill the model before any view is connected to it, so that
+    # nothing is listening for the rows being inserted.
+    model = Gtk.ListStore(str, str)
+    columns = [LanguageList.COLUMN_ID, LanguageList.COLUMN_TEXT]
+    for row in _get_language_rows():
+        model.insert_with_valuesv(-1, columns, row)
+    return model
+
+
 class LanguageList(Gtk.IconView):
     COLUMN_ID = 0
     COLUMN_TEXT = 1
+    __SEARCH_TIMEOUT_MS = 1000
+    """How long to wait after a keystroke to clear the search string."""
 
     def __init__(self, **props):
         super().__init__(
@@ -186,17 +277,18 @@ class LanguageList(Gtk.IconView):
             # TODO: Remove hard-coded size?
             item_width=144, **props
         )
-        model = Gtk.ListStore(str, str)
-        model.insert(-1, ['plain', _('Plain')])
-        lang_man = GtkSource.LanguageManager.get_default()
-        for lang_id in lang_man.props.language_ids:
-            lang = lang_man.get_language(lang_id)
-            if not lang.props.hidden:
-                model.insert(-1, [lang_id, lang.props.name])
-        self.props.model = model
+        self.props.model = _get_language_model()
+        self.__sorted_names = _get_sorted_language_names()
+        """
+        A sorted list of (normalized_name, row_index) tuples.
+
+        The names are normalized for searching.
+        """
         self.__search_string = ''
         self.__previous_selection = None
         self.__search_timeout = 0
+        self.__search_deadline = 0
+        """When to clear the search string, in monotonic microseconds."""
         self.__select_item(Gtk.TreePath.new_first())
 
     def __select_item(self, path):
@@ -209,7 +301,9 @@ class LanguageList(Gtk.IconView):
         if Gtk.IconView.do_key_press_event(self, event):
             return True
         else:
-            codepoint = Gdk.keyval_to_unicode(event.keyval)
+            codepoint = _KEYVAL_CODEPOINTS.get(event.keyval)
+            if codepoint is None:
+                codepoint = Gdk.keyval_to_unicode(event.keyval)
             if event.keyval == Gdk.KEY_BackSpace:
                 if self.__search_string:
                     self.__search_string = self.__search_string[:-1]
@@ -237,28 +331,43 @@ class LanguageList(Gtk.IconView):
         self.__search_string is empty, reset the selection to
         self.__previous_selection instead.  Then reset the search
         timeout."""
-        def callback(model, path, iter_):
-            name, = model.get(iter_, self.COLUMN_TEXT)
-            name = name.casefold().replace(' ', '')
-            search_string = self.__search_string.casefold().replace(' ', '')
-            if name.startswith(search_string):
-                self.__select_item(path)
-                return True
-            else:
-                return False
         if self.__search_string:
-            self.props.model.foreach(callback)
+            search_string = _normalize_for_search(self.__search_string)
+            sorted_names = self.__sorted_names
+            # The names starting with search_string are all sorted
+            # between search_string and search_string followed by the
+            # largest code point.
+            start = bisect_left(sorted_names, (search_string,))
+            end = bisect_left(sorted_names, (search_string + '\U0010ffff',))
+            if start < end:
+                # Select the first match in the list, not the first in
+                # alphabetical order.
+                index = min(
+                    index for _name, index in sorted_names[start:end]
+                )
+                self.__select_item(Gtk.TreePath.new_from_indices([index]))
         elif self.__previous_selection is not None:
             self.__select_item(self.__previous_selection)
-        if self.__search_timeout:
-            GLib.source_remove(self.__search_timeout)
-        self.__search_timeout = GLib.timeout_add(
-            1000, self.__clear_search_string
-        )
+        # Rather than replacing the timeout on every keystroke, just
+        # move the deadline.  The timeout checks it when it fires.
+        self.__search_deadline = (
+            _get_monotonic_time() + self.__SEARCH_TIMEOUT_MS * 1000
+        )
+        if not self.__search_timeout:
+            self.__search_timeout = _timeout_add(
+                self.__SEARCH_TIMEOUT_MS, self.__on_search_timeout
+            )
 
-    def __clear_search_string(self):
-        self.__search_string = ''
-        self.__search_timeout = 0
+    def __on_search_timeout(self):
+        remaining_us = self.__search_deadline - _get_monotonic_time()
+        if remaining_us > 0:
+            self.__search_timeout = _timeout_add(
+                remaining_us // 1000 + 1, self.__on_search_timeout
+            )
+        else:
+            self.__search_string = ''
+            self.__search_timeout = 0
+        return False
 
 
 class Find(make_menu_class(Gtk.Grid)):
@@ -12,6 +12,8 @@ This should enable the user to keep their hands on the keyboard and not
 spend time reaching for the mouse.
 """
 
+from collections import defaultdict
+from functools import lru_cache
 import gettext
 from gettext import gettext as _
 
@@ -26,6 +28,19 @@ from gi.repository import GLib, Gio, Gdk, Gtk
 from .editor import Editor
 
 
+@lru_cache(maxsize=None)
+def _get_home_prefix():
+    """
+    Return the home directory followed by a path separator.
+
+    The separator keeps e.g. ‘/home/benson’ from matching when the home
+    directory is ‘/home/ben’.  Return None if there is no home
+    directory.
+    """
+    home = GLib.get_home_dir()
+    return home.rstrip('/') + '/' if home else None
+
+
 def home_substitute(filename):
     """
     Replace home directory with '~'.
@@ -35,11 +50,9 @@ def home_substitute(filename):
     return ‘filename’ unmodified.  ‘filename’ should be an absolute
     path.
     """
-    home = GLib.get_home_dir()
-    if not home:
-        return filename
-    if filename.startswith(home):
-        return '~' + filename[len(home):]
+    home_prefix = _get_home_prefix()
+    if home_prefix and filename.startswith(home_prefix):
+        return '~/' + filename[len(home_prefix):]
     else:
         return filename
 
@@ -51,6 +64,14 @@ class Application(Gtk.Application):
             flags=Gio.ApplicationFlags.HANDLES_OPEN
         )
         self.__unnamed_window_number = 1
+        self.__basename_windows = defaultdict(set)
+        """
+        A mapping from basenames of the windows’ filenames to the sets
+        of windows with those basenames.
+
+        A window is added when its title is refreshed; see
+        __set_basename.
+        """
 
     def do_open(self, files, _n_files, _hint):
         for file in files:
@@ -68,43 +89,69 @@ class Application(Gtk.Application):
         if window.filename is None:
             window.__window_number = self.__unnamed_window_number
             self.__unnamed_window_number += 1
+        window.__basename = None
+        window.__basename_filename = None
         self.__refresh_window_title(window)
         window.connect(
             'notify::modified', lambda w, p: self.__refresh_window_title(w)
         )
 
     def __refresh_window_title(self, window):
+        filename = window.filename
+        if filename is None:
+            self.__set_basename(window, None)
+        elif filename != window.__basename_filename:
+            # The filename is new or was changed by “Save As”.
+            window.__basename_filename = filename
+            self.__set_basename(window, GLib.path_get_basename(filename))
         title = self.__get_display_filename(window)
         if window.props.modified:
             title = '✍ ' + title
         window.props.title = title
 
     def __get_display_filename(self, window):
-        windows = self.get_windows()
         if window.filename is None:
             return _('New File {:d}').format(window.__window_number)
+        elif len(self.__basename_windows[window.__basename]) > 1:
+            # Another window has a file with the same name.
+            return home_substitute(window.filename)
         else:
-            basenames = self.__get_basenames(window)
-            basename = GLib.path_get_basename(window.filename)
-            if basename in basenames:
-                return home_substitute(window.filename)
-            else:
-                return basename
-
-    def __get_basenames(self, window):
+            return window.__basename
+
+    def __set_basename(self, window, basename):
         """
-        Return the basenames of the filenames of all windows that have
-        filenames, except ‘window’.
+        Record the basename of a window’s filename.
+
+        ‘basename’ is None if the window has no filename or is being
+        removed.  When a basename starts or stops being shared by more
+        than one window, refresh the titles of the other windows with
+        that basename.
         """
-        return {
-            GLib.path_get_basename(w.filename) for w in self.get_windows()
-            if w is not window and w.filename is not None
-        }
+        old_basename = window.__basename
+        if basename == old_basename:
+            return
+        window.__basename = basename
+        changed_windows = []
+        if old_basename is not None:
+            windows = self.__basename_windows[old_basename]
+            windows.discard(window)
+            if len(windows) == 1:
+                changed_windows.extend(windows)
+            elif not windows:
+                del self.__basename_windows[old_basename]
+        if basename is not None:
+            windows = self.__basename_windows[basename]
+            windows.add(window)
+            if len(windows) == 2:
+                changed_windows.extend(w for w in windows if w is not window)
+        for w in changed_windows:
+            self.__refresh_window_title(w)
 
     def do_window_removed(self, window):
         Gtk.Application.do_window_removed(self, window)
-        for w in self.get_windows():
-            self.__refresh_window_title(w)
+        # Only windows that shared a basename with this one can have
+        # their titles changed by its removal.
+        self.__set_basename(window, None)
 
     def show_open_dialog(self, window):
         chooser = Gtk.FileChooserNative(
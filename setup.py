@@ -1,9 +1,9 @@
 #! /usr/bin/env python3
 
-import glob
 import os
 import os.path
-import re
+import runpy
+import subprocess
 
 from setuptools import setup
 try:
@@ -13,74 +13,58 @@ except ModuleNotFoundError:
 from distutils.errors import DistutilsFileError
 
 
-with open('README.md', 'r') as readme:
-    long_description = readme.read()
-
 source_dir = os.path.dirname(__file__)
-icon_sizes = []
-for icon_size_dir in glob.iglob(os.path.join(source_dir, 'icons', '*')):
-    icon_size_str = re.match(
-        r'([0-9]+)x[0-9]+', os.path.basename(icon_size_dir)
-    )[1]
-    icon_sizes.append(int(icon_size_str))
+# The icon directories are named like '16x16'.
+icon_sizes = [
+    int(entry.name.partition('x')[0])
+    for entry in os.scandir(os.path.join(source_dir, 'icons'))
+    if entry.is_dir()
+]
 print(f'Icon sizes: {icon_sizes}')
+icon_data_files = [
+    (f'share/icons/hicolor/{s}x{s}/apps', [f'icons/{s}x{s}/scriggle.png'])
+    for s in icon_sizes
+]
 
 
 class build(orig_build):
     def run(self):
         svg_file = os.path.join(source_dir, 'scriggle.svg')
+        svg_mtime = os.stat(svg_file).st_mtime
+        stale_sizes = []
         for size in icon_sizes:
             png_file = os.path.join(
                 source_dir, 'icons', f'{size}x{size}', 'scriggle.png'
             )
-            if os.stat(svg_file).st_mtime > os.stat(png_file).st_mtime:
+            if svg_mtime > os.stat(png_file).st_mtime:
+                stale_sizes.append(size)
+        if stale_sizes:
+            print(f'Rasterizing icons for sizes {stale_sizes}')
+            # Load build_icons.py by path, since the source directory is
+            # not necessarily on sys.path.
+            build_icons = runpy.run_path(
+                os.path.join(source_dir, 'build_icons.py')
+            )
+            try:
+                build_icons['rasterize_all'](stale_sizes)
+            except (FileNotFoundError, subprocess.CalledProcessError) as e:
                 raise DistutilsFileError(
-                    f'{svg_file} is newer than the rasterized icon file '
-                    f'{png_file}.  You must run ./build_icons.py to update '
-                     'the rasterized icons.'
-                )
+                    f'{svg_file} is newer than the rasterized icons, and '
+                    f'rebuilding them with Inkscape failed ({e}).  Install '
+                     'Inkscape and run ./build_icons.py to update the '
+                     'rasterized icons.'
+                ) from e
         super().run()
 
 
 setup(
-    name='Scriggle',
-    version='0.1',
-    author='Ben Bethge',
-    author_email='bethge931@gmail.com',
-    description='Keyboard-only graphical text editor',
-    long_description=long_description,
-    long_description_content_type='text/markdown',
-    url='https://github.com/bbethge/scriggle/',
-    license='GPLv3+',
-    classifiers=[
-        'Development Status :: 3 - Alpha',
-        'Environment :: MacOS X',
-        'Environment :: Win32 (MS Windows)',
-        'Environment :: X11 Applications',
-        'Environment :: X11 Applications :: Gnome',
-        'Environment :: X11 Applications :: GTK',
-        'Intended Audience :: Developers',
-        'License :: OSI Approved'
-           ' :: GNU General Public License v3 or later (GPLv3+)',
-        'Natural Language :: English',
-        'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3',
-        'Topic :: Text Editors'
-    ],
-    python_requires='>=3',
     zip_safe=False,
+    include_package_data=False,
     packages=['scriggle'],
-    entry_points={'gui_scripts': ['scriggle = scriggle.scriggle:main']},
     cmdclass={'build': build},
     data_files=[
         ('share/icons/hicolor/scalable/apps', ['scriggle.svg']),
-        *[
-            (
-                f'share/icons/hicolor/{s}x{s}/apps',
-                [f'icons/{s}x{s}/scriggle.png'],
-            )
-            for s in icon_sizes
-        ],
+        *icon_data_files,
         ('share/applications', ['scriggle.desktop']),
     ]
 )